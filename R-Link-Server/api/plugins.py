@@ -14,6 +14,7 @@ from pathlib import Path
 
 from core.plugin_manager import PluginManager
 from core.plugin_interface import PluginState
+from api.console import set_plugin_manager as set_console_plugin_manager
 
 logger = logging.getLogger(__name__)
 
@@ -404,8 +405,7 @@ async def uninstall_plugin(request: PluginUninstallRequest):
         shutil.rmtree(plugin_dir)
 
     # 从管理器中移除
-    if request.name in plugin_manager.plugins:
-        del plugin_manager.plugins[request.name]
+    plugin_manager.remove_plugin(request.name)
 
     return {
         "status": "success",
@@ -497,6 +497,8 @@ async def _reload_plugin_manager():
     old_manager = plugin_manager
     plugin_manager = PluginManager(plugins_dir="plugins", builtin_dir="builtin")
     set_plugin_manager(plugin_manager)
-    # 清理旧管理器
+    set_console_plugin_manager(plugin_manager)
+    # 清理旧管理器（进程池由新管理器共享，保留正在运行的插件进程；
+    # 未变化的 Python 插件交给新管理器继续运行，已删除或已修改的被停止）
     if old_manager:
-        old_manager.cleanup()
+        old_manager.cleanup(stop_processes=False, successor=plugin_manager)
@@ -72,18 +72,17 @@ class SSHConnectionManager:
         """更新连接状态"""
         conn = self.connections.get(connection_id)
         if conn:
+            now = datetime.now()
             conn.status = status
             conn.error = error
-            if status == SSHConnectionStatus.CONNECTED:
-                conn.connected_at = datetime.now()
-            conn.last_activity = datetime.now()
+            if status is SSHConnectionStatus.CONNECTED:
+                conn.connected_at = now
+            conn.last_activity = now
 
     def close_connection(self, connection_id: str):
         """关闭连接"""
-        if connection_id in self.connections:
-            del self.connections[connection_id]
-        if connection_id in self.websockets:
-            del self.websockets[connection_id]
+        self.connections.pop(connection_id, None)
+        self.websockets.pop(connection_id, None)
 
     def list_connections(self) -> list:
         """列出所有连接"""
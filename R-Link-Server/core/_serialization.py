@@ -0,0 +1,43 @@
+"""
+序列化工具
+
+JSON 安装了 orjson 时使用 orjson，否则回退到标准库 json；
+YAML 优先使用 libyaml 的 C 加载器
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    def json_dumps(obj: Any) -> bytes:
+        """序列化为带缩进的 UTF-8 JSON"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj: Any) -> bytes:
+        """序列化为带缩进的 UTF-8 JSON"""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+    json_loads = json.loads
+
+
+_yaml_mod = None
+_yaml_loader = None
+
+
+def _yaml():
+    """按需导入 yaml，只有 JSON manifest 时不产生导入开销"""
+    global _yaml_mod, _yaml_loader
+    if _yaml_mod is None:
+        import yaml
+        # 优先使用 libyaml 提供的 C 加载器
+        _yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        _yaml_mod = yaml
+    return _yaml_mod
+
+
+def yaml_safe_load(stream) -> Any:
+    """安全解析 YAML"""
+    return _yaml().load(stream, Loader=_yaml_loader)
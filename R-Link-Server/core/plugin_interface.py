@@ -30,7 +30,7 @@ class PluginInfo:
     icon: Optional[str] = None   # 图标路径
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class PluginState:
     """插件运行状态"""
     status: PluginStatus
@@ -5,23 +5,82 @@ Responsible for plugin discovery, loading, and management
 Supports both binary plugins (exe) and Python plugins (.py)
 """
 import os
+import copy
 import json
-import yaml
 import logging
-import importlib.util
-import sys
-from typing import Dict, List, Optional, Any, Union
+import functools
+import weakref
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, List, Optional, Any, Set, Tuple, Union
 from dataclasses import dataclass, field
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-from .plugin_interface import PluginInfo, PluginState, PluginStatus, IPlugin
-from .process_pool import ProcessPool
+from ._serialization import json_dumps, json_loads, yaml_safe_load
+from .plugin_interface import PluginInfo, PluginState, PluginStatus
 from .python_plugin import PythonPlugin, PythonPluginInfo, PythonPluginManager
 
+if TYPE_CHECKING:
+    from .process_pool import ProcessPool
+
 logger = logging.getLogger(__name__)
 
+# 按优先级排列的 manifest 文件名
+MANIFEST_FILES = ("manifest.yaml", "manifest.json")
+
+# (plugins_dir, builtin_dir) -> 共享实例
+# 重新创建 PluginManager（热重载、测试）时复用，保留正在运行的进程句柄
+_shared_process_pools: "weakref.WeakValueDictionary[Tuple[str, str], ProcessPool]" = weakref.WeakValueDictionary()
+_shared_python_managers: "weakref.WeakValueDictionary[Tuple[str, str], PythonPluginManager]" = weakref.WeakValueDictionary()
+
+
+def _binary_command_unsupported(command: str, args: Dict[str, Any] = None) -> Dict[str, str]:
+    """二进制插件不支持自定义命令"""
+    return {"error": "Command not supported by binary plugins"}
+
+
+def _plugin_not_found(command: str, args: Dict[str, Any] = None) -> Dict[str, str]:
+    """插件不存在"""
+    return {"error": "Plugin not found"}
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    """获取路径的 mtime_ns，不存在时返回 None"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _file_signature(path: Optional[str]) -> Optional[List[int]]:
+    """文件的 [mtime_ns, size]，原地修改文件不会改变所在目录的 mtime，需单独校验"""
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _python_plugin_signature(plugin: PythonPlugin) -> List[Any]:
+    """Python 插件目录、manifest 和入口文件的签名，重新加载时据此判断插件是否变化"""
+    plugin_dir = plugin.plugin_dir
+    return [
+        plugin_dir,
+        _mtime_ns(plugin_dir),
+        [_file_signature(os.path.join(plugin_dir, name)) for name in MANIFEST_FILES],
+        _file_signature(os.path.join(plugin_dir, plugin.info.entry_file)),
+    ]
+
+
+@functools.lru_cache(maxsize=256)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """按 (路径, mtime, 大小) 缓存 JSON 文件的解析结果"""
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
 
-@dataclass
+@dataclass(slots=True)
 class PluginManifest:
     """Plugin Manifest"""
     name: str
@@ -42,22 +101,44 @@ class PluginManifest:
 class BinaryPlugin:
     """Binary Plugin Wrapper"""
 
+    __slots__ = (
+        "manifest",
+        "plugin_dir",
+        "config_path",
+        "binary_path",
+        "_get_process_pool",
+        "_config_dir_created",
+        "_config_written",
+    )
+
     def __init__(
         self,
         manifest: PluginManifest,
         plugin_dir: str,
-        process_pool: ProcessPool
+        get_process_pool: Callable[[], "ProcessPool"]
     ):
         self.manifest = manifest
         self.plugin_dir = plugin_dir
-        self.process_pool = process_pool
+        # 进程池在首次启动/查询插件时才创建
+        self._get_process_pool = get_process_pool
         self.config_path = os.path.join(plugin_dir, "config", f"{manifest.name}.json")
         self.binary_path = os.path.join(plugin_dir, manifest.binary)
-        self._ensure_config_dir()
+        # 配置目录由 PluginManager 在发现插件后统一创建
+        self._config_dir_created = False
+        # 配置文件只由 _save_config 写入，无需每次询问文件系统
+        self._config_written = os.path.exists(self.config_path)
+
+    @property
+    def process_pool(self) -> "ProcessPool":
+        """Process pool"""
+        return self._get_process_pool()
 
     def _ensure_config_dir(self):
         """Ensure config directory exists"""
+        if self._config_dir_created:
+            return
         os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+        self._config_dir_created = True
 
     def get_info(self) -> PluginInfo:
         """Get plugin info"""
@@ -101,10 +182,11 @@ class BinaryPlugin:
 
     def get_config(self) -> Dict[str, Any]:
         """Get config"""
-        if os.path.exists(self.config_path):
+        if self._config_written:
             try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                st = os.stat(self.config_path)
+                # 深拷贝：嵌套的 args/env 不能与缓存共享，否则调用方的修改会污染缓存
+                return copy.deepcopy(_load_json_cached(self.config_path, st.st_mtime_ns, st.st_size))
             except Exception as e:
                 logger.error(f"Error loading config: {e}")
         return self.manifest.default_config.copy()
@@ -132,16 +214,20 @@ class BinaryPlugin:
 
     def _save_config(self, config: Dict[str, Any]):
         """Save config"""
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2)
+        self._ensure_config_dir()
+        data = json_dumps(config)
+        with open(self.config_path, 'wb') as f:
+            f.write(data)
+        self._config_written = True
+        # 防止粗粒度 mtime 的文件系统上命中旧内容
+        _load_json_cached.cache_clear()
 
     def _build_args(self, config: Dict[str, Any]) -> List[str]:
         """Build command line args from config"""
         args = []
         if 'args' in config:
             args.extend(config['args'])
-        if os.path.exists(self.config_path):
+        if self._config_written:
             args.extend(['-c', self.config_path])
         return args
 
@@ -156,39 +242,190 @@ class BinaryPlugin:
 class PluginManager:
     """Plugin Manager - 支持二进制插件和 Python 插件"""
 
-    def __init__(self, plugins_dir: str = "plugins", builtin_dir: str = "builtin"):
+    def __init__(
+        self,
+        plugins_dir: str = "plugins",
+        builtin_dir: str = "builtin",
+        cache_file: str = "config/plugin_cache.json"
+    ):
         self.plugins_dir = plugins_dir
         self.builtin_dir = builtin_dir
+        self.cache_file = cache_file
+        cache = self._read_plugin_cache()
+        # manifest 路径 -> [mtime_ns, size, manifest 数据]
+        self._manifest_cache: Dict[str, List[Any]] = cache.get("manifests", {})
+        # 本次加载读到的 manifest，写回缓存时只保留这些，已删除插件的条目随之清除
+        self._seen_manifests: Set[str] = set()
+        # 上次的目录扫描结果，目录未变化时跳过扫描
+        self._discovery_cache: Optional[Dict[str, Any]] = cache.get("discovery")
+        self._plugin_cache_dirty = False
         self.plugins: Dict[str, Union[BinaryPlugin, PythonPlugin]] = {}
-        self.process_pool = ProcessPool()
-        self.python_plugin_manager = PythonPluginManager(plugins_dir, builtin_dir)
+        # 按类型分桶，热路径通过成员判断分派，避免逐个 isinstance
+        self._binary: Dict[str, BinaryPlugin] = {}
+        self._python: Dict[str, PythonPlugin] = {}
+        # 插件名 -> 命令执行函数，注册时确定
+        self._cmd_dispatch: Dict[str, Callable[..., Any]] = {}
+        self._builtin_set: FrozenSet[str] = frozenset()
+        self._user_set: FrozenSet[str] = frozenset()
+        # 按发现顺序排列的插件名称，列表接口的返回顺序保持稳定
+        self._builtin_names: Tuple[str, ...] = ()
+        self._user_names: Tuple[str, ...] = ()
+        self._info_cache: Optional[List[PluginInfo]] = None
+        # Python 插件名 -> 加载时的签名，重新加载时未变化的插件交给新管理器继续运行
+        self._python_signatures: Dict[str, List[Any]] = {}
+        self._shared_key = (os.path.abspath(plugins_dir), os.path.abspath(builtin_dir))
+        # 已有存活的共享实例时立即持有引用，避免旧管理器释放后被回收
+        if self._shared_key in _shared_process_pools:
+            self.__dict__["process_pool"] = _shared_process_pools[self._shared_key]
+        if self._shared_key in _shared_python_managers:
+            self.__dict__["python_plugin_manager"] = _shared_python_managers[self._shared_key]
         self._load_plugins()
 
+    @functools.cached_property
+    def process_pool(self) -> "ProcessPool":
+        """进程池（首次使用时创建，同目录的管理器之间共享）"""
+        pool = _shared_process_pools.get(self._shared_key)
+        if pool is None:
+            from .process_pool import ProcessPool
+            pool = ProcessPool()
+            _shared_process_pools[self._shared_key] = pool
+        return pool
+
+    @functools.cached_property
+    def python_plugin_manager(self) -> PythonPluginManager:
+        """Python 插件管理器（首次使用时创建，同目录的管理器之间共享）"""
+        manager = _shared_python_managers.get(self._shared_key)
+        if manager is None:
+            manager = PythonPluginManager(self.plugins_dir, self.builtin_dir)
+            _shared_python_managers[self._shared_key] = manager
+        return manager
+
+    def _get_process_pool(self) -> "ProcessPool":
+        """供 BinaryPlugin 延迟获取进程池"""
+        return self.process_pool
+
     def _load_plugins(self):
         """加载所有插件（二进制 + Python）"""
-        # 加载二进制插件
-        self._load_binary_plugins()
-        # 加载 Python 插件
-        self._load_python_plugins()
-
-    def _load_binary_plugins(self):
-        """加载二进制插件"""
-        self._load_from_dir(self.plugins_dir, "user", "binary")
-        self._load_from_dir(self.builtin_dir, "builtin", "binary")
-
-    def _load_python_plugins(self):
-        """加载 Python 插件"""
-        self._load_from_dir(self.plugins_dir, "user", "python")
-        self._load_from_dir(self.builtin_dir, "builtin", "python")
-
-    def _load_from_dir(self, dir_path: str, dir_type: str, plugin_type: str = "binary"):
+        records = self._cached_discovery()
+        if records is None:
+            records = self._discover_plugins()
+
+        for plugin_dir, dir_type, manifest_file, is_binary, *_ in records:
+            manifest_path = Path(manifest_file) if manifest_file else None
+            if is_binary:
+                self._load_binary_plugin_from_dir(Path(plugin_dir), dir_type, manifest_path)
+            else:
+                self._load_python_plugin_from_dir(Path(plugin_dir), dir_type, manifest_path)
+
+        # 统一创建二进制插件的配置目录
+        for plugin in self._binary.values():
+            try:
+                plugin._ensure_config_dir()
+            except OSError as e:
+                logger.warning(f"Error creating config dir for {plugin.manifest.name}: {e}")
+
+        # 建立内置/用户插件索引
+        self._rebuild_plugin_index()
+        self._python_signatures = {
+            name: _python_plugin_signature(plugin) for name, plugin in self._python.items()
+        }
+
+    def _discover_plugins(self) -> List[List[Any]]:
+        """
+        完整扫描插件目录，并记录结果供下次启动复用
+
+        Returns:
+            [[插件目录, 目录类型, manifest 路径, 是否二进制, 目录 mtime_ns, manifest 签名]]
+        """
+        candidates = self._collect_plugin_dirs(self.plugins_dir, "user")
+        candidates += self._collect_plugin_dirs(self.builtin_dir, "builtin")
+
+        records = []
+        if candidates:
+            # 目录扫描和 manifest 解析是 I/O 密集型，并行执行；
+            # 插件实例化仍在当前线程按顺序进行，保证内置插件覆盖同名用户插件
+            with ThreadPoolExecutor(max_workers=min(32, len(candidates))) as executor:
+                scans = list(executor.map(self._scan_plugin_dir, [c[0] for c in candidates]))
+
+            for (plugin_dir, dir_type), (manifest_file, is_binary, mtime_ns, signature) in zip(candidates, scans):
+                records.append([
+                    plugin_dir,
+                    dir_type,
+                    str(manifest_file) if manifest_file else None,
+                    is_binary,
+                    mtime_ns,
+                    signature,
+                ])
+
+        self._discovery_cache = {
+            "dirs": self._root_dir_mtimes(),
+            "plugins": records,
+        }
+        self._plugin_cache_dirty = True
+        return records
+
+    def _cached_discovery(self) -> Optional[List[List[Any]]]:
+        """
+        目录未变化时返回上次的扫描结果
+
+        插件根目录的 mtime 只在增删插件时变化，插件目录的 mtime 在增删文件时变化；
+        原地修改 manifest 不改变目录 mtime，而是否为二进制插件取决于 manifest 内容，
+        所以还要校验每个 manifest 的 (mtime_ns, size)
+        """
+        cache = self._discovery_cache
+        if not cache or cache.get("dirs") != self._root_dir_mtimes():
+            return None
+
+        records = cache.get("plugins", [])
+        for record in records:
+            # 旧版本缓存没有 manifest 签名，按未命中处理
+            if len(record) < 6 or _mtime_ns(record[0]) != record[4]:
+                return None
+            if _file_signature(record[2]) != record[5]:
+                return None
+        logger.info("Plugin directories unchanged, using cached discovery")
+        return records
+
+    def _root_dir_mtimes(self) -> Dict[str, Optional[int]]:
+        """插件根目录的 mtime"""
+        return {
+            self.plugins_dir: _mtime_ns(self.plugins_dir),
+            self.builtin_dir: _mtime_ns(self.builtin_dir),
+        }
+
+    def _register_plugin(self, name: str, plugin: Union[BinaryPlugin, PythonPlugin]):
+        """注册插件并使插件信息缓存失效"""
+        # 同名插件可能被不同类型的插件覆盖
+        self._binary.pop(name, None)
+        self._python.pop(name, None)
+        if isinstance(plugin, PythonPlugin):
+            self._python[name] = plugin
+            self._cmd_dispatch[name] = plugin.execute_command
+        else:
+            self._binary[name] = plugin
+            self._cmd_dispatch[name] = _binary_command_unsupported
+        self.plugins[name] = plugin
+        self._info_cache = None
+
+    def _rebuild_plugin_index(self):
+        """按内置/用户划分插件名称，供 O(1) 查询"""
+        builtin = {name for name, plugin in self._binary.items() if plugin.manifest.builtin}
+        builtin.update(name for name, plugin in self._python.items() if plugin.info.builtin)
+        self._builtin_set = frozenset(builtin)
+        self._user_set = frozenset(self.plugins.keys() - builtin)
+        self._builtin_names = tuple(name for name in self.plugins if name in builtin)
+        self._user_names = tuple(name for name in self.plugins if name not in builtin)
+
+    def _collect_plugin_dirs(self, dir_path: str, dir_type: str) -> List[Tuple[str, str]]:
         """
-        从目录加载插件
+        收集目录下的插件目录
 
         Args:
             dir_path: 插件目录路径
             dir_type: 目录类型 (user/builtin)
-            plugin_type: 插件类型 (binary/python)
+
+        Returns:
+            [(插件目录路径, 目录类型)]
         """
         plugins_path = Path(dir_path)
 
@@ -196,37 +433,78 @@ class PluginManager:
             if dir_type == "user":
                 logger.info(f"Creating plugins directory: {dir_path}")
                 plugins_path.mkdir(exist_ok=True)
-            return
+            return []
 
         if not plugins_path.is_dir():
             logger.warning(f"Path {dir_path} is not a directory")
-            return
+            return []
 
-        for plugin_dir in plugins_path.iterdir():
-            if not plugin_dir.is_dir():
-                continue
+        with os.scandir(dir_path) as it:
+            return [(entry.path, dir_type) for entry in it if entry.is_dir()]
 
-            # Python 插件可能有单独的目录
-            if plugin_type == "python" or (plugin_type == "binary" and not self._has_binary_plugin(plugin_dir)):
-                self._load_python_plugin_from_dir(plugin_dir, dir_type)
-            else:
-                self._load_binary_plugin_from_dir(plugin_dir, dir_type)
+    def _scan_plugin_dir(self, plugin_dir: str) -> Tuple[Optional[Path], bool, Optional[int], Optional[List[int]]]:
+        """
+        扫描单个插件目录并解析 manifest（可在工作线程中执行）
+
+        Returns:
+            (manifest 文件路径, 是否为二进制插件, 目录 mtime_ns, manifest 签名)
+        """
+        # 先记录 mtime，扫描期间发生的变化会在下次启动时被发现
+        mtime_ns = _mtime_ns(plugin_dir)
+        try:
+            manifest_file, has_binary, has_python = self._classify_plugin_dir(plugin_dir)
+        except OSError as e:
+            logger.error(f"Error scanning plugin directory {plugin_dir}: {e}")
+            return None, False, None, None
+        # 解析之前取签名，解析期间的修改会在下次启动时被发现
+        signature = _file_signature(str(manifest_file) if manifest_file else None)
+        is_binary = self._has_binary_plugin(manifest_file, has_binary, has_python)
+        return manifest_file, is_binary, mtime_ns, signature
+
+    def _classify_plugin_dir(self, plugin_dir: str) -> Tuple[Optional[Path], bool, bool]:
+        """
+        单次 scandir 扫描插件目录
 
-    def _has_binary_plugin(self, plugin_dir: Path) -> bool:
+        Returns:
+            (manifest 文件路径, 是否包含二进制文件, 是否包含 .py 文件)
+        """
+        manifests = set()
+        has_binary = False
+        has_python = False
+        with os.scandir(plugin_dir) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                name = entry.name
+                if name in MANIFEST_FILES:
+                    manifests.add(name)
+                    continue
+                # 隐藏文件（如 .gitkeep）不算作二进制
+                suffix = os.path.splitext(name)[1]
+                if suffix == ".py":
+                    has_python = True
+                elif suffix in (".exe", "") and not name.startswith("."):
+                    has_binary = True
+                if has_binary and has_python and MANIFEST_FILES[0] in manifests:
+                    break
+
+        # manifest.yaml 优先于 manifest.json
+        for name in MANIFEST_FILES:
+            if name in manifests:
+                return Path(plugin_dir) / name, has_binary, has_python
+        return None, has_binary, has_python
+
+    def _has_binary_plugin(
+        self,
+        manifest_file: Optional[Path],
+        has_binary: bool,
+        has_python: bool
+    ) -> bool:
         """检查目录中是否包含二进制插件"""
         # 检查 manifest 文件中的 binary 字段
-        manifest_file = plugin_dir / "manifest.yaml"
-        if not manifest_file.exists():
-            manifest_file = plugin_dir / "manifest.json"
-
-        if manifest_file.exists():
+        if manifest_file:
             try:
-                with open(manifest_file, 'r', encoding='utf-8') as f:
-                    if manifest_file.suffix in ['.yaml', '.yml']:
-                        import yaml
-                        data = yaml.safe_load(f)
-                    else:
-                        data = json.load(f)
+                data = self._read_manifest_data(manifest_file)
                 # 如果 manifest 中有 binary 字段，则是二进制插件
                 if 'binary' in data:
                     return True
@@ -236,26 +514,18 @@ class PluginManager:
             except Exception:
                 pass
 
-        # 没有 manifest 或无法读取，通过文件类型判断
-        has_binary = any(f.suffix in [".exe", ""] for f in plugin_dir.iterdir() if f.is_file())
-        has_python = any(f.suffix == ".py" for f in plugin_dir.iterdir() if f.is_file())
+        # 没有 manifest 或无法读取，通过文件类型判断：
+        # 有二进制文件且没有 .py 文件则是二进制插件，否则默认当作 Python 插件
+        return has_binary and not has_python
 
-        # 如果有二进制文件且没有 .py 文件（排除 build 目录），则是二进制插件
-        if has_binary and not has_python:
-            return True
-        # 如果有 __init__.py，可能是 Python 包插件
-        if (plugin_dir / "__init__.py").exists():
-            return False
-        # 默认当作 Python 插件
-        return False
-
-    def _load_binary_plugin_from_dir(self, plugin_dir: Path, dir_type: str):
+    def _load_binary_plugin_from_dir(
+        self,
+        plugin_dir: Path,
+        dir_type: str,
+        manifest_file: Optional[Path]
+    ):
         """从目录加载二进制插件"""
-        manifest_file = plugin_dir / "manifest.yaml"
-        if not manifest_file.exists():
-            manifest_file = plugin_dir / "manifest.json"
-
-        if not manifest_file.exists():
+        if not manifest_file:
             logger.warning(f"No manifest found in {plugin_dir.name}")
             return
 
@@ -266,23 +536,25 @@ class PluginManager:
             plugin = BinaryPlugin(
                 manifest=manifest,
                 plugin_dir=str(plugin_dir),
-                process_pool=self.process_pool
+                get_process_pool=self._get_process_pool
             )
-            self.plugins[manifest.name] = plugin
+            self._register_plugin(manifest.name, plugin)
             logger.info(f"Loaded {dir_type} binary plugin: {manifest.name} v{manifest.version}")
 
         except Exception as e:
             logger.error(f"Error loading {dir_type} binary plugin {plugin_dir.name}: {e}")
 
-    def _load_python_plugin_from_dir(self, plugin_dir: Path, dir_type: str):
+    def _load_python_plugin_from_dir(
+        self,
+        plugin_dir: Path,
+        dir_type: str,
+        manifest_file: Optional[Path]
+    ):
         """从目录加载 Python 插件"""
         # 首先尝试加载 manifest
-        manifest_file = plugin_dir / "manifest.yaml"
-        if manifest_file.exists():
+        if manifest_file:
             try:
-                import yaml
-                with open(manifest_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
+                data = self._read_manifest_data(manifest_file)
 
                 # 字段映射：manifest -> PythonPluginInfo
                 mapped_data = {
@@ -302,17 +574,21 @@ class PluginManager:
                 info = PythonPluginInfo(**mapped_data)
 
                 plugin = PythonPlugin(info, str(plugin_dir))
-                self.plugins[info.name] = plugin
+                self._register_plugin(info.name, plugin)
                 logger.info(f"Loaded {dir_type} Python plugin: {info.name}")
                 return
 
             except Exception as e:
                 logger.error(f"Error loading Python plugin manifest from {plugin_dir.name}: {e}")
 
-        # 如果没有 manifest，尝试自动检测
-        py_files = list(plugin_dir.glob("*.py"))
-        if py_files:
-            self._load_python_plugin_without_manifest(plugin_dir, py_files[0], dir_type)
+        # 如果没有 manifest，尝试自动检测（只需要第一个 .py 文件）
+        with os.scandir(plugin_dir) as it:
+            entry_name = next(
+                (e.name for e in it if e.name.endswith(".py") and e.is_file()),
+                None
+            )
+        if entry_name:
+            self._load_python_plugin_without_manifest(plugin_dir, entry_name, dir_type)
         else:
             # 检查是否有 __init__.py
             init_file = plugin_dir / "__init__.py"
@@ -321,10 +597,9 @@ class PluginManager:
             else:
                 logger.warning(f"No valid Python plugin found in {plugin_dir.name}")
 
-    def _load_python_plugin_without_manifest(self, plugin_dir: Path, entry_file: Path, dir_type: str):
+    def _load_python_plugin_without_manifest(self, plugin_dir: Path, entry_filename: str, dir_type: str):
         """加载没有 manifest 的 Python 插件"""
         name = plugin_dir.name
-        entry_filename = entry_file.name
 
         info = PythonPluginInfo(
             name=name,
@@ -337,7 +612,7 @@ class PluginManager:
         )
 
         plugin = PythonPlugin(info, str(plugin_dir))
-        self.plugins[info.name] = plugin
+        self._register_plugin(info.name, plugin)
         logger.info(f"Loaded {dir_type} Python plugin (no manifest): {info.name}")
 
     def _load_python_package_plugin(self, plugin_dir: Path, dir_type: str):
@@ -355,16 +630,22 @@ class PluginManager:
         )
 
         plugin = PythonPlugin(info, str(plugin_dir))
-        self.plugins[info.name] = plugin
+        self._register_plugin(info.name, plugin)
         logger.info(f"Loaded {dir_type} Python package plugin: {info.name}")
 
     def get_all_plugins(self) -> List[PluginInfo]:
         """Get all plugin info"""
+        if self._info_cache is None:
+            self._info_cache = self._build_plugin_infos()
+        return list(self._info_cache)
+
+    def _build_plugin_infos(self) -> List[PluginInfo]:
+        """构建所有插件信息（插件增删时才需要重建）"""
         result = []
-        for plugin in self.plugins.values():
-            if isinstance(plugin, BinaryPlugin):
+        for name, plugin in self.plugins.items():
+            if name in self._binary:
                 result.append(plugin.get_info())
-            elif isinstance(plugin, PythonPlugin):
+            else:
                 # 将 PythonPluginInfo 转换为 PluginInfo
                 info = plugin.get_info()
                 plugin_info = PluginInfo(
@@ -385,38 +666,28 @@ class PluginManager:
 
     def is_builtin(self, name: str) -> bool:
         """检查是否为内置插件"""
-        plugin = self.get_plugin(name)
-        if not plugin:
-            return False
-        if isinstance(plugin, BinaryPlugin):
-            return plugin.manifest.builtin
-        elif isinstance(plugin, PythonPlugin):
-            return plugin.info.builtin
-        return False
+        return name in self._builtin_set
 
     def get_builtin_plugins(self) -> List[str]:
         """获取所有内置插件名称"""
-        builtin = []
-        for name, plugin in self.plugins.items():
-            if isinstance(plugin, BinaryPlugin):
-                if plugin.manifest.builtin:
-                    builtin.append(name)
-            elif isinstance(plugin, PythonPlugin):
-                if plugin.info.builtin:
-                    builtin.append(name)
-        return builtin
+        return list(self._builtin_names)
 
     def get_user_plugins(self) -> List[str]:
         """获取所有用户插件名称"""
-        user = []
-        for name, plugin in self.plugins.items():
-            if isinstance(plugin, BinaryPlugin):
-                if not plugin.manifest.builtin:
-                    user.append(name)
-            elif isinstance(plugin, PythonPlugin):
-                if not plugin.info.builtin:
-                    user.append(name)
-        return user
+        return list(self._user_names)
+
+    def remove_plugin(self, name: str) -> bool:
+        """从管理器中移除插件"""
+        if name not in self.plugins:
+            return False
+        del self.plugins[name]
+        self._binary.pop(name, None)
+        self._python.pop(name, None)
+        self._cmd_dispatch.pop(name, None)
+        self._python_signatures.pop(name, None)
+        self._info_cache = None
+        self._rebuild_plugin_index()
+        return True
 
     def start_plugin(self, name: str, config: Dict[str, Any] = None) -> bool:
         """启动插件"""
@@ -425,10 +696,7 @@ class PluginManager:
             logger.error(f"Plugin {name} not found")
             return False
 
-        if isinstance(plugin, PythonPlugin):
-            return plugin.start(config)
-        else:
-            return plugin.start(config)
+        return plugin.start(config)
 
     def stop_plugin(self, name: str) -> bool:
         """停止插件（内置插件不能停止）"""
@@ -436,15 +704,10 @@ class PluginManager:
         if not plugin:
             return False
 
-        if isinstance(plugin, PythonPlugin):
-            return plugin.stop()
-        elif isinstance(plugin, BinaryPlugin):
-            if plugin.manifest.builtin:
-                logger.warning(f"Cannot stop builtin plugin: {name}")
-                return False
-            return plugin.stop()
-        else:
+        if name in self._binary and plugin.manifest.builtin:
+            logger.warning(f"Cannot stop builtin plugin: {name}")
             return False
+        return plugin.stop()
 
     def restart_plugin(self, name: str) -> bool:
         """重启插件"""
@@ -459,51 +722,38 @@ class PluginManager:
         if not plugin:
             return None
 
-        if isinstance(plugin, PythonPlugin):
-            status = plugin.get_status()
-            # 转换为 PluginState
-            return PluginState(
-                status=PluginStatus.STOPPED if status["status"] == "loaded" else PluginStatus.RUNNING,
-                pid=status.get("pid"),
-                port=status.get("port"),
-                uptime=status.get("uptime", 0),
-                memory_usage=status.get("memory_usage", 0),
-                cpu_usage=status.get("cpu_usage", 0),
-                last_error=status.get("last_error")
-            )
-        else:
-            return plugin.get_status()
+        if name in self._python:
+            return self._python_state(plugin)
+        return plugin.get_status()
 
     def get_all_statuses(self) -> Dict[str, PluginState]:
         """获取所有插件状态"""
-        result = {}
-        for name, plugin in self.plugins.items():
-            if isinstance(plugin, BinaryPlugin):
-                result[name] = plugin.get_status()
-            elif isinstance(plugin, PythonPlugin):
-                status = plugin.get_status()
-                # 转换 dict 为 PluginState
-                status_value = status.get("status", "unknown")
-                if status_value == "loaded":
-                    plugin_status = PluginStatus.STOPPED
-                elif status_value == "running":
-                    plugin_status = PluginStatus.RUNNING
-                elif status_value == "error":
-                    plugin_status = PluginStatus.ERROR
-                else:
-                    plugin_status = PluginStatus.STOPPED
-
-                result[name] = PluginState(
-                    status=plugin_status,
-                    pid=status.get("pid"),
-                    port=status.get("port"),
-                    uptime=status.get("uptime", 0),
-                    memory_usage=status.get("memory_usage", 0),
-                    cpu_usage=status.get("cpu_usage", 0),
-                    last_error=status.get("last_error")
-                )
+        result = self.process_pool.get_states_bulk(list(self._binary)) if self._binary else {}
+        for name, plugin in self._python.items():
+            result[name] = self._python_state(plugin)
         return result
 
+    def _python_state(self, plugin: PythonPlugin) -> PluginState:
+        """将 Python 插件的状态 dict 转换为 PluginState"""
+        status = plugin.get_status()
+        status_value = status.get("status", "unknown")
+        if status_value == "running":
+            plugin_status = PluginStatus.RUNNING
+        elif status_value == "error":
+            plugin_status = PluginStatus.ERROR
+        else:
+            plugin_status = PluginStatus.STOPPED
+
+        return PluginState(
+            status=plugin_status,
+            pid=status.get("pid"),
+            port=status.get("port"),
+            uptime=status.get("uptime", 0),
+            memory_usage=status.get("memory_usage", 0),
+            cpu_usage=status.get("cpu_usage", 0),
+            last_error=status.get("last_error")
+        )
+
     def get_plugin_config(self, name: str) -> Optional[Dict[str, Any]]:
         """获取插件配置"""
         plugin = self.get_plugin(name)
@@ -527,25 +777,111 @@ class PluginManager:
 
     def execute_command(self, name: str, command: str, args: Dict[str, Any] = None) -> Any:
         """执行插件命令"""
-        plugin = self.get_plugin(name)
-        if not plugin:
-            return {"error": "Plugin not found"}
+        return self._cmd_dispatch.get(name, _plugin_not_found)(command, args)
 
-        if isinstance(plugin, PythonPlugin):
-            return plugin.execute_command(command, args)
-        else:
-            # 二进制插件不支持自定义命令
-            return {"error": "Command not supported by binary plugins"}
+    def cleanup(self, stop_processes: bool = True, successor: Optional["PluginManager"] = None):
+        """
+        清理所有插件
+
+        Args:
+            stop_processes: 是否停止进程池中的进程；
+                重新加载时进程池由新管理器共享，应传入 False
+            successor: 重新加载时替代本管理器的新管理器；
+                目录、manifest 和入口文件都未变化的运行中 Python 插件交给它继续运行，
+                其余已启动的 Python 插件会被停止，否则旧实例会失去句柄而无法再停止
+        """
+        # 进程池未创建说明从未启动过二进制插件
+        if stop_processes and "process_pool" in self.__dict__:
+            self.process_pool.cleanup()
+        for name, plugin in self._python.items():
+            if plugin.instance is None and not (plugin.future and not plugin.future.done()):
+                continue
+            if successor is not None and successor._adopt_python_plugin(
+                name, plugin, self._python_signatures.get(name)
+            ):
+                logger.info(f"Python plugin {name} unchanged, keeping it running")
+                continue
+            plugin.stop()
+        self._write_plugin_cache()
 
-    def cleanup(self):
-        """清理所有插件"""
-        self.process_pool.cleanup()
+    def _adopt_python_plugin(self, name: str, plugin: PythonPlugin, signature: Optional[List[Any]]) -> bool:
+        """接管旧管理器中仍在运行的 Python 插件，插件已变化或已删除时返回 False"""
+        if name not in self._python or signature is None:
+            return False
+        if self._python_signatures.get(name) != signature:
+            return False
+        self._register_plugin(name, plugin)
+        return True
 
     def _load_manifest(self, manifest_path: Path) -> PluginManifest:
         """加载插件清单"""
+        return PluginManifest(**self._read_manifest_data(manifest_path))
+
+    def _read_manifest_data(self, manifest_path: Path) -> Dict[str, Any]:
+        """
+        读取 manifest 原始数据
+
+        以 (mtime_ns, size) 校验磁盘缓存，命中时跳过 YAML/JSON 解析
+        """
+        key = str(manifest_path)
+        st = os.stat(manifest_path)
+        self._seen_manifests.add(key)
+        cached = self._manifest_cache.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return dict(cached[2])
+
         with open(manifest_path, 'r', encoding='utf-8') as f:
             if manifest_path.suffix in ['.yaml', '.yml']:
-                data = yaml.safe_load(f)
+                data = yaml_safe_load(f)
             else:
                 data = json.load(f)
-        return PluginManifest(**data)
+
+        self._manifest_cache[key] = [st.st_mtime_ns, st.st_size, data]
+        self._plugin_cache_dirty = True
+        return dict(data)
+
+    def _read_plugin_cache(self) -> Dict[str, Any]:
+        """读取插件磁盘缓存"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if isinstance(cache, dict):
+                return cache
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring invalid plugin cache {self.cache_file}: {e}")
+        return {}
+
+    def _write_plugin_cache(self):
+        """写回插件磁盘缓存"""
+        stale = self._manifest_cache.keys() - self._seen_manifests
+        if stale:
+            for key in stale:
+                del self._manifest_cache[key]
+            self._plugin_cache_dirty = True
+        if not self._plugin_cache_dirty:
+            return
+        try:
+            data = json.dumps({
+                "manifests": self._serializable_manifests(),
+                "discovery": self._discovery_cache,
+            }, ensure_ascii=False)
+            os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                f.write(data)
+            self._plugin_cache_dirty = False
+        except Exception as e:
+            logger.warning(f"Error writing plugin cache {self.cache_file}: {e}")
+
+    def _serializable_manifests(self) -> Dict[str, List[Any]]:
+        """可写入 JSON 的 manifest 缓存条目，含 YAML 特有类型（日期、集合等）的条目只跳过自身"""
+        result = {}
+        for key, entry in self._manifest_cache.items():
+            try:
+                json.dumps(entry, ensure_ascii=False)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Not caching manifest {key}: {e}")
+                continue
+            result[key] = entry
+        return result
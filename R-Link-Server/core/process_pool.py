@@ -5,19 +5,70 @@
 """
 import asyncio
 import psutil
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
 import json
+import mmap
 import os
+import time
 
 from .plugin_interface import PluginStatus, PluginState
+from .process_wait import wait_for_exit
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# 进程状态最小采样间隔（秒），间隔内返回缓存的状态
+STATE_SAMPLE_INTERVAL = 1.0
+
+# 超过此大小的日志使用 mmap 读取
+MMAP_TAIL_THRESHOLD = 1024 * 1024
+
+
+def _tail_file(path: str, n: int, block: int = 8192) -> str:
+    """
+    读取文件末尾 n 行
+
+    从文件末尾向前查找，耗时只与末尾 n 行的大小有关，与文件大小无关；
+    大文件直接在 mmap 上查找换行符，避免 read() 和中间缓冲区
+    """
+    if n <= 0:
+        return ""
+
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size > MMAP_TAIL_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = len(mm)
+                # 多找一个换行符才能确定第 n 行的起点
+                for _ in range(n + 1):
+                    pos = mm.rfind(b"\n", 0, pos)
+                    if pos < 0:
+                        break
+                data = mm[max(pos, 0):]
+        else:
+            chunks = []
+            newlines = 0
+            pos = size
+            while pos > 0 and newlines <= n:
+                read_size = min(block, pos)
+                pos -= read_size
+                f.seek(pos)
+                chunk = f.read(read_size)
+                newlines += chunk.count(b"\n")
+                chunks.append(chunk)
+            data = b"".join(reversed(chunks))
+
+    lines = data.splitlines(keepends=True)
+    text = b"".join(lines[-n:]).decode('utf-8', errors='replace')
+    # 与文本模式读取保持一致，统一换行符
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+@dataclass(slots=True, eq=False)
 class ProcessInfo:
     """进程信息"""
     plugin_name: str
@@ -27,6 +78,7 @@ class ProcessInfo:
     config: Dict[str, Any] = field(default_factory=dict)
     port: Optional[int] = None
     log_file: Optional[str] = None
+    cpu_primed: bool = False      # cpu_percent 是否已完成首次（基准）调用
 
 
 class ProcessPool:
@@ -34,6 +86,10 @@ class ProcessPool:
 
     def __init__(self):
         self.processes: Dict[str, ProcessInfo] = {}
+        # 插件名 -> (采样时间, 状态)
+        self._last_sample: Dict[str, Tuple[float, PluginState]] = {}
+        # 并行采样用的线程池，首次需要时创建并在进程池生命周期内复用
+        self._sample_executor: Optional[ThreadPoolExecutor] = None
         self.logs_dir = "logs"
         os.makedirs(self.logs_dir, exist_ok=True)
 
@@ -62,6 +118,7 @@ class ProcessPool:
             self.stop_process(plugin_name)
 
         del self.processes[plugin_name]
+        self._last_sample.pop(plugin_name, None)
         logger.info(f"Removed plugin {plugin_name} from process pool")
         return True
 
@@ -85,6 +142,7 @@ class ProcessPool:
 
         try:
             process_info.status = PluginStatus.STARTING
+            self._last_sample.pop(plugin_name, None)
 
             # 准备命令
             cmd = [binary_path]
@@ -96,19 +154,29 @@ class ProcessPool:
             if env:
                 process_env.update(env)
 
-            # 启动进程
-            with open(process_info.log_file, 'a') as log_f:
+            # 启动进程，子进程直接写入日志文件描述符
+            log_fd = os.open(
+                process_info.log_file,
+                os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+                0o644
+            )
+            try:
                 process = psutil.Popen(
                     cmd,
-                    stdout=log_f,
-                    stderr=log_f,
+                    stdout=log_fd,
+                    stderr=log_fd,
                     env=process_env,
-                    cwd=working_dir,
-                    text=True
+                    cwd=working_dir
                 )
+            finally:
+                # 子进程已复制该描述符
+                os.close(log_fd)
 
             process_info.process = process
             process_info.start_time = datetime.now()
+            # 建立 CPU 使用率基准，之后的非阻塞采样才有意义
+            process.cpu_percent(interval=None)
+            process_info.cpu_primed = True
 
             # 检查进程是否成功启动
             if process.is_running():
@@ -136,6 +204,7 @@ class ProcessPool:
             return True
 
         process_info.status = PluginStatus.STOPPING
+        self._last_sample.pop(plugin_name, None)
 
         try:
             process = process_info.process
@@ -143,12 +212,11 @@ class ProcessPool:
                 # 尝试优雅关闭
                 process.terminate()
 
-                try:
-                    process.wait(timeout=timeout)
-                except psutil.TimeoutExpired:
+                if not wait_for_exit(process.pid, timeout):
                     # 强制终止
                     process.kill()
-                    process.wait()
+                # 回收子进程，此时进程已退出，不会阻塞
+                process.wait()
 
             process_info.status = PluginStatus.STOPPED
             process_info.process = None
@@ -181,12 +249,22 @@ class ProcessPool:
         if plugin_name not in self.processes:
             return None
 
-        process_info = self.processes[plugin_name]
+        return self._compute_state(self.processes[plugin_name])
+
+    def _compute_state(self, process_info: ProcessInfo) -> PluginState:
+        """根据进程信息计算状态（采样间隔内返回缓存）"""
+        now = time.monotonic()
+        cached = self._last_sample.get(process_info.plugin_name)
+        if cached and now - cached[0] < STATE_SAMPLE_INTERVAL:
+            return cached[1]
 
-        # 更新状态
-        if process_info.process:
+        # 更新状态，is_running() 的结果在下面复用
+        process = process_info.process
+        running = False
+        if process:
             try:
-                if process_info.process.is_running():
+                running = process.is_running()
+                if running:
                     process_info.status = PluginStatus.RUNNING
                 else:
                     process_info.status = PluginStatus.STOPPED
@@ -202,13 +280,20 @@ class ProcessPool:
         memory_usage = 0
         cpu_usage = 0
         try:
-            if process_info.process and process_info.process.is_running():
-                memory_usage = process_info.process.memory_info().rss / 1024 / 1024  # MB
-                cpu_usage = process_info.process.cpu_percent(interval=0.1)
+            if running:
+                # oneshot 内多次读取共用同一次 /proc 查询
+                with process.oneshot():
+                    memory_usage = process.memory_info().rss / 1024 / 1024  # MB
+                    # 非阻塞模式：返回距上次调用以来的 CPU 使用率
+                    cpu_usage = process.cpu_percent(interval=None)
+                if not process_info.cpu_primed:
+                    # 首次调用只建立基准，返回值没有意义
+                    cpu_usage = 0
+                    process_info.cpu_primed = True
         except:
             pass
 
-        return PluginState(
+        state = PluginState(
             status=process_info.status,
             pid=process_info.process.pid if process_info.process else None,
             port=process_info.port,
@@ -216,13 +301,55 @@ class ProcessPool:
             memory_usage=memory_usage,
             cpu_usage=cpu_usage
         )
+        self._last_sample[process_info.plugin_name] = (now, state)
+        return state
 
     def get_all_states(self) -> Dict[str, PluginState]:
         """获取所有进程状态"""
-        return {
-            name: self.get_process_state(name)
-            for name in self.processes.keys()
-        }
+        # 先取快照，遍历期间其他线程增删进程不会影响迭代
+        snapshot = dict(self.processes)
+        states = self._compute_states(list(snapshot.values()))
+        return dict(zip(snapshot, states))
+
+    def get_states_bulk(self, names: List[str]) -> Dict[str, Optional[PluginState]]:
+        """
+        批量获取进程状态
+
+        一次遍历返回所有请求的状态，不在池中的插件返回 None
+        """
+        processes = self.processes
+        infos = [processes[name] for name in names if name in processes]
+        states = dict(zip(
+            (info.plugin_name for info in infos),
+            self._compute_states(infos)
+        ))
+        return {name: states.get(name) for name in names}
+
+    def _compute_states(self, infos: List[ProcessInfo]) -> List[PluginState]:
+        """
+        批量计算状态
+
+        采样间隔内的进程直接返回缓存；缓存已过期的进程读 /proc 是系统调用密集的，
+        放到线程池里并行采样
+        """
+        now = time.monotonic()
+        last_sample = self._last_sample
+        cold = []
+        for info in infos:
+            cached = last_sample.get(info.plugin_name)
+            # 没有子进程的插件不读 /proc，留给下面顺序计算
+            if info.process and (not cached or now - cached[0] >= STATE_SAMPLE_INTERVAL):
+                cold.append(info)
+
+        if len(cold) > 1:
+            if self._sample_executor is None:
+                self._sample_executor = ThreadPoolExecutor(
+                    max_workers=8,
+                    thread_name_prefix="state-sample"
+                )
+            list(self._sample_executor.map(self._compute_state, cold))
+
+        return [self._compute_state(info) for info in infos]
 
     def get_process_logs(self, plugin_name: str, lines: int = 100) -> str:
         """获取进程日志"""
@@ -236,9 +363,7 @@ class ProcessPool:
             return ""
 
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                all_lines = f.readlines()
-                return ''.join(all_lines[-lines:])
+            return _tail_file(log_file, lines)
         except Exception as e:
             logger.error(f"Error reading logs for {plugin_name}: {e}")
             return ""
@@ -247,3 +372,6 @@ class ProcessPool:
         """清理所有进程"""
         for plugin_name in list(self.processes.keys()):
             self.stop_process(plugin_name)
+        if self._sample_executor is not None:
+            self._sample_executor.shutdown(wait=False)
+            self._sample_executor = None
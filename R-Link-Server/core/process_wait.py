@@ -0,0 +1,59 @@
+"""
+进程退出等待
+
+用内核事件代替轮询等待进程退出：
+Linux (>= 5.3) 使用 pidfd_open + poll，macOS/BSD 使用 kqueue，其余平台回退到 psutil
+"""
+import os
+import select
+
+import psutil
+
+
+def wait_for_exit(pid: int, timeout: float) -> bool:
+    """
+    等待进程退出
+
+    只等待退出事件，不回收子进程，调用方仍需 wait() 回收僵尸进程
+    返回进程是否在超时前退出
+    """
+    if hasattr(os, "pidfd_open"):
+        try:
+            fd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            # 内核不支持 pidfd，走下面的回退路径
+            fd = None
+
+        if fd is not None:
+            try:
+                poller = select.poll()
+                poller.register(fd, select.POLLIN)
+                return bool(poller.poll(timeout * 1000))
+            finally:
+                os.close(fd)
+
+    if hasattr(select, "kqueue"):
+        kq = select.kqueue()
+        try:
+            event = select.kevent(
+                pid,
+                filter=select.KQ_FILTER_PROC,
+                flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                fflags=select.KQ_NOTE_EXIT
+            )
+            try:
+                return bool(kq.control([event], 1, timeout))
+            except ProcessLookupError:
+                return True
+        finally:
+            kq.close()
+
+    try:
+        psutil.Process(pid).wait(timeout=timeout)
+    except psutil.NoSuchProcess:
+        pass
+    except psutil.TimeoutExpired:
+        return False
+    return True
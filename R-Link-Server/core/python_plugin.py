@@ -5,18 +5,32 @@ Python Plugin Runner
 import sys
 import os
 import json
+import asyncio
+import ctypes
+import inspect
 import logging
 import subprocess
 import threading
 import time
 import importlib.util
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List, Tuple, Union
+from dataclasses import dataclass, replace
 from enum import Enum
 
+from ._serialization import json_dumps, json_loads, yaml_safe_load
+
 logger = logging.getLogger(__name__)
 
+# 插件入口模块在 sys.modules 中的命名空间，避免与已安装的包（如 requests、yaml）重名
+PLUGIN_MODULE_PREFIX = "rlink_plugins"
+
+# 停止插件时等待 run() 自行退出的时间（秒），超时后向线程注入 SystemExit
+STOP_GRACE_PERIOD = 0.2
+# 注入 SystemExit 后继续等待的时间（秒）
+STOP_TIMEOUT = 5
 
 class PythonPluginStatus(Enum):
     """Python 插件状态"""
@@ -26,7 +40,7 @@ class PythonPluginStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class PythonPluginInfo:
     """Python 插件信息"""
     name: str
@@ -60,7 +74,10 @@ class PythonPlugin:
         self.status = PythonPluginStatus.UNLOADED
         self.module = None
         self.instance = None
-        self.thread: Optional[threading.Thread] = None
+        self.future: Optional[Future] = None
+        # 正在执行 run() 的专属线程 id，用于停止超时后注入异常；读写都持有 _tid_lock
+        self.tid: Optional[int] = None
+        self._tid_lock = threading.Lock()
         self.stop_event = threading.Event()
         self.config_path = os.path.join(plugin_dir, "config", f"{info.name}.json")
         self._ensure_config_dir()
@@ -69,13 +86,15 @@ class PythonPlugin:
         """确保配置目录存在"""
         os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
 
+    @property
+    def module_name(self) -> str:
+        """入口模块在 sys.modules 中的名称"""
+        return f"{PLUGIN_MODULE_PREFIX}.{self.info.name.replace('-', '_')}"
+
     def load(self) -> bool:
         """加载 Python 插件"""
         try:
-            # 添加插件目录到 Python 路径
             plugin_path = Path(self.plugin_dir)
-            if str(plugin_path) not in sys.path:
-                sys.path.insert(0, str(plugin_path))
 
             # 动态导入模块
             entry_file = plugin_path / self.info.entry_file
@@ -85,12 +104,23 @@ class PythonPlugin:
                 if not pyd_file.exists():
                     raise FileNotFoundError(f"Plugin entry file not found: {entry_file}")
 
+            # 以插件目录作为包的搜索路径，插件内可用相对导入引用同目录模块，
+            # 不需要把每个插件目录加入全局 sys.path
+            module_name = self.module_name
             spec = importlib.util.spec_from_file_location(
-                self.info.name.replace("-", "_"),
-                str(entry_file)
+                module_name,
+                str(entry_file),
+                submodule_search_locations=[str(plugin_path)]
             )
-            self.module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(self.module)
+            module = importlib.util.module_from_spec(spec)
+            # 相对导入需要先在 sys.modules 中找到父包
+            sys.modules[module_name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                sys.modules.pop(module_name, None)
+                raise
+            self.module = module
 
             self.status = PythonPluginStatus.LOADED
             logger.info(f"Python plugin loaded: {self.info.name}")
@@ -141,14 +171,14 @@ class PythonPlugin:
             if not self.instantiate(final_config):
                 return False
 
-            # 如果插件有 run 方法，在单独线程中运行
-            if hasattr(self.instance, 'run') and callable(self.instance.run):
+            # 如果插件有 run 方法，协程调度到事件循环，普通函数在插件专属线程中运行
+            run = getattr(self.instance, 'run', None)
+            if callable(run):
                 self.stop_event.clear()
-                self.thread = threading.Thread(
-                    target=self._run_plugin,
-                    daemon=True
-                )
-                self.thread.start()
+                if inspect.iscoroutinefunction(run):
+                    self.future = self._schedule_coroutine()
+                else:
+                    self.future = self._start_thread()
             else:
                 # 没有 run 方法，认为已启动
                 self.status = PythonPluginStatus.RUNNING
@@ -161,18 +191,71 @@ class PythonPlugin:
             self.status = PythonPluginStatus.ERROR
             return False
 
+    def _schedule_coroutine(self) -> Future:
+        """调度协程 run 方法，没有运行中的事件循环时在专属线程中执行"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._start_thread()
+        return asyncio.run_coroutine_threadsafe(self._run_plugin_async(), loop)
+
+    def _start_thread(self) -> Future:
+        """
+        在插件专属的守护线程中运行 run()，通过 Future 报告结束
+
+        run() 通常是不返回的长循环，不能放进固定大小的共享线程池：
+        池满后新插件只会排队，且非守护线程会阻止解释器退出
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+        thread = threading.Thread(
+            target=self._run_in_thread,
+            args=(future,),
+            name=f"plugin-{self.info.name}",
+            daemon=True
+        )
+        thread.start()
+        return future
+
+    def _run_in_thread(self, future: Future):
+        """线程入口，stop() 注入的 SystemExit 也记录到 Future 中"""
+        try:
+            self._run_plugin()
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(None)
+
     def _run_plugin(self):
-        """在单独线程中运行插件"""
+        """在专属线程中运行插件"""
+        with self._tid_lock:
+            self.tid = threading.get_ident()
         try:
             if hasattr(self.instance, 'run') and callable(self.instance.run):
                 # 传递停止事件
                 if hasattr(self.instance, 'set_stop_event'):
                     self.instance.set_stop_event(self.stop_event)
-                # 执行 run 方法
+                # 执行 run 方法，协程在本线程的事件循环中运行
                 result = self.instance.run()
+                if inspect.iscoroutine(result):
+                    result = asyncio.run(result)
                 logger.info(f"Plugin {self.info.name} run() returned: {result}")
         except Exception as e:
             logger.error(f"Plugin {self.info.name} run error: {e}")
+        finally:
+            with self._tid_lock:
+                self.tid = None
+            self.status = PythonPluginStatus.LOADED
+
+    async def _run_plugin_async(self):
+        """在事件循环中运行协程插件"""
+        try:
+            if hasattr(self.instance, 'set_stop_event'):
+                self.instance.set_stop_event(self.stop_event)
+            result = await self.instance.run()
+            logger.info(f"Plugin {self.info.name} run() returned: {result}")
+        except Exception as e:
+            logger.error(f"Plugin {self.info.name} run error: {e}")
         finally:
             self.status = PythonPluginStatus.LOADED
 
@@ -185,9 +268,17 @@ class PythonPlugin:
             if self.instance and hasattr(self.instance, 'stop') and callable(self.instance.stop):
                 self.instance.stop()
 
-            # 等待线程结束
-            if self.thread and self.thread.is_alive():
-                self.thread.join(timeout=5)
+            # 协程插件直接取消，会收到 CancelledError；
+            # 线程中运行的插件短暂等待其结束，超时则注入 SystemExit
+            if self.future:
+                self.future.cancel()
+                if not self.future.done():
+                    wait([self.future], timeout=STOP_GRACE_PERIOD)
+                if not self.future.done():
+                    self._interrupt_run()
+                    wait([self.future], timeout=STOP_TIMEOUT)
+                    if not self.future.done():
+                        logger.warning(f"Plugin {self.info.name} run() did not exit in time")
 
             self.status = PythonPluginStatus.LOADED
             logger.info(f"Python plugin stopped: {self.info.name}")
@@ -197,6 +288,24 @@ class PythonPlugin:
             logger.error(f"Failed to stop plugin {self.info.name}: {e}")
             return False
 
+    def _interrupt_run(self):
+        """
+        在执行 run() 的线程中抛出 SystemExit（线程阻塞在 C 调用中时要等其返回才生效）
+
+        只注入插件专属线程：持有 _tid_lock 确认 run() 仍在执行，
+        run() 已返回时 tid 为 None，不会误伤其他线程
+        """
+        with self._tid_lock:
+            tid = self.tid
+            if tid is None:
+                return
+            count = ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                ctypes.c_ulong(tid), ctypes.py_object(SystemExit)
+            )
+            if count > 1:
+                # 不应发生，撤销以免影响其他线程
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(tid), None)
+
     def restart(self) -> bool:
         """重启插件"""
         config = self.get_config()
@@ -224,8 +333,8 @@ class PythonPlugin:
         """获取配置"""
         if os.path.exists(self.config_path):
             try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    return json_loads(f.read())
             except Exception as e:
                 logger.error(f"Error loading config: {e}")
         return self.info.default_config.copy()
@@ -257,10 +366,20 @@ class PythonPlugin:
             return {"error": str(e)}
 
     def _save_config(self, config: Dict[str, Any]):
-        """保存配置"""
+        """保存配置（先写临时文件再替换，避免中途失败留下不完整的配置）"""
         os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        data = json_dumps(config)
+        tmp_path = self.config_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.config_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
 
     def cleanup(self):
         """清理资源"""
@@ -275,9 +394,27 @@ class PythonPluginManager:
     def __init__(self, plugins_dir: str = "plugins", builtin_dir: str = "builtin"):
         self.plugins_dir = plugins_dir
         self.builtin_dir = builtin_dir
-        self.plugins: Dict[str, PythonPlugin] = {}
+        # 写时复制：写入方构建新字典后整体替换引用，读取无需加锁
+        self._plugins: Mapping[str, PythonPlugin] = MappingProxyType({})
+        self._write_lock = threading.Lock()
+        # manifest 路径 -> (mtime_ns, size, 插件信息)
+        self._manifest_cache: Dict[str, Tuple[int, int, PythonPluginInfo]] = {}
         self._load_plugins()
 
+    @property
+    def plugins(self) -> Mapping[str, PythonPlugin]:
+        """插件表的只读快照"""
+        return self._plugins
+
+    def _publish_plugins(self, updates: Dict[str, PythonPlugin]):
+        """合并新插件并替换插件表"""
+        if not updates:
+            return
+        with self._write_lock:
+            new = dict(self._plugins)
+            new.update(updates)
+            self._plugins = MappingProxyType(new)
+
     def _load_plugins(self):
         """加载所有 Python 插件"""
         self._load_from_dir(self.plugins_dir, "user")
@@ -285,38 +422,73 @@ class PythonPluginManager:
 
     def _load_from_dir(self, dir_path: str, dir_type: str):
         """从目录加载插件"""
-        plugins_path = Path(dir_path)
-        if not plugins_path.exists():
+        if not os.path.isdir(dir_path):
             return
 
-        for plugin_dir in plugins_path.iterdir():
-            if not plugin_dir.is_dir():
-                continue
+        # DirEntry.is_dir() 使用读取目录时得到的类型信息，无需逐个 stat
+        manifest_files = []
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+
+                manifest_file = os.path.join(entry.path, "manifest.yaml")
+                if not os.path.exists(manifest_file):
+                    manifest_file = os.path.join(entry.path, "manifest.json")
+
+                if not os.path.exists(manifest_file):
+                    continue
+
+                manifest_files.append(Path(manifest_file))
 
-            manifest_file = plugin_dir / "manifest.yaml"
-            if not manifest_file.exists():
-                manifest_file = plugin_dir / "manifest.json"
+        if not manifest_files:
+            return
 
-            if not manifest_file.exists():
-                continue
+        # manifest 的读取和解析以 IO 为主，并行执行；注册插件仍在当前线程完成
+        with ThreadPoolExecutor(max_workers=min(8, len(manifest_files))) as executor:
+            results = list(executor.map(self._try_load_manifest, manifest_files))
 
+        loaded: Dict[str, PythonPlugin] = {}
+        for manifest_file, info in zip(manifest_files, results):
+            plugin_dir = manifest_file.parent
             try:
-                info = self._load_manifest(manifest_file)
+                if isinstance(info, Exception):
+                    raise info
                 info.builtin = (dir_type == "builtin")
 
                 plugin = PythonPlugin(info, str(plugin_dir))
-                self.plugins[info.name] = plugin
+                loaded[info.name] = plugin
                 logger.info(f"Loaded Python plugin: {info.name} ({dir_type})")
 
             except Exception as e:
                 logger.error(f"Error loading Python plugin {plugin_dir.name}: {e}")
 
+        self._publish_plugins(loaded)
+
+    def _try_load_manifest(self, manifest_path: Path) -> Union[PythonPluginInfo, Exception]:
+        """加载插件清单，出错时返回异常而不抛出（供线程池使用）"""
+        try:
+            return self._load_manifest(manifest_path)
+        except Exception as e:
+            return e
+
     def _load_manifest(self, manifest_path: Path) -> PythonPluginInfo:
-        """加载插件清单"""
-        import yaml
+        """加载插件清单（文件未变化时返回缓存的副本）"""
+        key = str(manifest_path)
+        st = manifest_path.stat()
+        cached = self._manifest_cache.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return replace(cached[2])
+
         with open(manifest_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) if manifest_path.suffix in ['.yaml', '.yml'] else json.load(f)
-        return PythonPluginInfo(**data)
+            if manifest_path.suffix in ['.yaml', '.yml']:
+                data = yaml_safe_load(f)
+            else:
+                data = json.load(f)
+
+        info = PythonPluginInfo(**data)
+        self._manifest_cache[key] = (st.st_mtime_ns, st.st_size, info)
+        return replace(info)
 
     def get_all_plugins(self) -> List[PythonPluginInfo]:
         """获取所有插件信息"""
@@ -335,7 +507,7 @@ class PythonPluginManager:
         try:
             # 卸载模块
             if plugin.module:
-                module_name = plugin.info.name.replace("-", "_")
+                module_name = plugin.module_name
                 if module_name in sys.modules:
                     del sys.modules[module_name]
                     # 同时删除子模块
@@ -4,9 +4,16 @@ Supabase 认证模块
 处理用户认证和权限验证
 """
 import os
+import time
+import asyncio
+import base64
+import hashlib
+import json
+import importlib.util
 import httpx
 import logging
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping, Tuple
 from fastapi import Security, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
@@ -17,10 +24,33 @@ SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY", "")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
 
+# token 验证结果缓存时间（秒）和最大条目数
+TOKEN_CACHE_TTL = 30.0
+TOKEN_CACHE_SIZE = 1024
+
+# HTTP/2 需要 h2 包（httpx[http2]），缺失时使用 HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 # 安全认证方案
 security = HTTPBearer(auto_error=False)
 
 
+def _token_key(token: str) -> bytes:
+    """token 的缓存键，只保存哈希，不在内存里保留原始 JWT"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _token_exp(token: str) -> Optional[float]:
+    """读取 JWT 的 exp 声明（不校验签名），解析失败返回 None"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+
 class SupabaseAuth:
     """Supabase 认证管理器"""
 
@@ -28,20 +58,42 @@ class SupabaseAuth:
         self.supabase_url = SUPABASE_URL
         self.anon_key = SUPABASE_ANON_KEY
         self.service_key = SUPABASE_SERVICE_ROLE_KEY
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # 请求头在进程生命周期内不变，预先构建并冻结
+        self._anon_headers = self._build_headers(self.anon_key)
+        self._service_headers = self._build_headers(self.service_key)
+        # 复用长连接，HTTP/2 下并发验证在同一连接上多路复用
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=60.0
+            ),
+            headers={"apikey": self.anon_key}
+        )
+        # token 哈希 -> (过期时间, 用户信息)
+        self._user_cache: Dict[bytes, Tuple[float, Dict[str, Any]]] = {}
+        self._cache_ttl = TOKEN_CACHE_TTL
+        # 正在进行的验证请求，同一 token 的并发调用共用一次请求
+        self._inflight: Dict[bytes, asyncio.Task] = {}
 
     async def close(self):
         """关闭 HTTP 客户端"""
         await self.client.aclose()
 
-    def _get_headers(self, use_service_key: bool = False) -> Dict[str, str]:
-        """获取请求头"""
-        api_key = self.service_key if use_service_key else self.anon_key
-        return {
+    @staticmethod
+    def _build_headers(api_key: str) -> Mapping[str, str]:
+        """构建只读请求头"""
+        return MappingProxyType({
             "apikey": api_key,
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
-        }
+        })
+
+    def _get_headers(self, use_service_key: bool = False) -> Mapping[str, str]:
+        """获取请求头"""
+        return self._service_headers if use_service_key else self._anon_headers
 
     async def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
@@ -56,24 +108,58 @@ class SupabaseAuth:
         if not token:
             return None
 
+        key = _token_key(token)
+        now = time.time()
+        cached = self._user_cache.get(key)
+        if cached:
+            if cached[0] > now:
+                return cached[1]
+            del self._user_cache[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_user(key, token))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # shield：某个调用方被取消时不影响共用的请求
+        return await asyncio.shield(inflight)
+
+    async def _fetch_user(self, key: bytes, token: str) -> Optional[Dict[str, Any]]:
+        """向 Supabase 请求用户信息，成功时写入缓存"""
         try:
             response = await self.client.get(
                 f"{self.supabase_url}/auth/v1/user",
-                headers={
-                    "apikey": self.anon_key,
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json"
-                }
+                headers={"Authorization": f"Bearer {token}"}
             )
 
             if response.status_code == 200:
-                return response.json()
+                user_data = response.json()
+                self._cache_user(key, token, user_data)
+                return user_data
             return None
 
         except Exception as e:
             logger.error(f"Token verification error: {e}")
             return None
 
+    def _cache_user(self, key: bytes, token: str, user_data: Dict[str, Any]):
+        """缓存验证成功的结果，缓存时间不超过 token 自身的有效期"""
+        now = time.time()
+        expires = now + self._cache_ttl
+        exp = _token_exp(token)
+        if exp is not None:
+            expires = min(expires, exp)
+        if expires <= now:
+            return
+
+        cache = self._user_cache
+        cache.pop(key, None)
+        if len(cache) >= TOKEN_CACHE_SIZE:
+            # 淘汰最早写入的条目
+            del cache[next(iter(cache))]
+        cache[key] = (expires, user_data)
+
     async def get_user(self, token: str) -> Optional[Dict[str, Any]]:
         """获取用户信息"""
         user_data = await self.verify_token(token)
@@ -5,7 +5,10 @@ R-Link-Server 主入口
 """
 import sys
 import os
+import atexit
 import logging
+import logging.handlers
+import queue
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -16,9 +19,16 @@ if str(_current_dir) not in sys.path:
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 
+try:
+    import orjson  # noqa: F401
+    # orjson 序列化比标准库 json 快数倍
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
 from core.plugin_manager import PluginManager
 from core.supabase_auth import auth_manager
 from api.plugins import router as plugins_router, set_plugin_manager
@@ -34,14 +44,56 @@ Path("logs").mkdir(exist_ok=True)
 Path("config").mkdir(exist_ok=True)
 Path("plugins").mkdir(exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
+
+def _setup_logging():
+    """
+    配置日志
+
+    日志记录只入队，由监听线程统一格式化并写入文件和控制台，请求处理不阻塞在写日志上。
+    以 `python main.py` 启动时本模块会以 __main__ 和 main 各执行一次，
+    第二次发现已有监听器时直接返回，避免重复添加处理器导致每条日志输出两次
+    """
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers:
+        if isinstance(handler, logging.handlers.QueueHandler) and getattr(handler, "listener", None):
+            return
+
+    log_queue = queue.SimpleQueue()
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
         logging.FileHandler('logs/server.log'),
         logging.StreamHandler(sys.stdout)
     ]
-)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.listener = listener
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(queue_handler)
+    # uvicorn 关闭和插件停止时仍会写日志，监听线程要到进程退出时才停止
+    atexit.register(_stop_logging, queue_handler, listener)
+
+
+def _stop_logging(queue_handler: logging.handlers.QueueHandler, listener: logging.handlers.QueueListener):
+    """
+    停止日志监听线程
+
+    先把文件和控制台处理器直接挂回根日志器，之后的日志同步写出，不会滞留在无人处理的队列中；
+    stop() 会写完队列中剩余的日志
+    """
+    root_logger = logging.getLogger()
+    if queue_handler not in root_logger.handlers:
+        return
+    root_logger.removeHandler(queue_handler)
+    for handler in listener.handlers:
+        root_logger.addHandler(handler)
+    listener.stop()
+
+
+_setup_logging()
 logger = logging.getLogger(__name__)
 
 # 全局插件管理器
@@ -79,7 +131,8 @@ app = FastAPI(
     title="R-Link-Server",
     description="R-Link 插件化管理平台后端服务",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=DefaultResponse
 )
 
 # 配置 CORS
@@ -123,7 +176,7 @@ async def health_check():
 async def global_exception_handler(request, exc):
     """全局异常处理"""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return DefaultResponse(
         status_code=500,
         content={"detail": str(exc)}
     )
@@ -131,11 +184,19 @@ async def global_exception_handler(request, exc):
 
 def main():
     """主函数"""
+    # DEV=1 时启用自动重载（开发模式，与多进程互斥）
+    dev = os.getenv("DEV") == "1"
+    # 每个 worker 进程拥有独立的插件管理器和进程池，插件状态不共享，默认单进程
+    workers = None if dev else int(os.getenv("WEB_CONCURRENCY", "1"))
+    # loop/http 保持 auto：安装了 uvicorn[standard] 时自动使用 uvloop 和 httptools，
+    # Windows 上没有 uvloop 时回退到 asyncio
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8210,
-        reload=True,  # 开发模式，生产环境设置为 False
+        reload=dev,
+        workers=workers,
+        backlog=2048,
         log_level="info"
     )
 
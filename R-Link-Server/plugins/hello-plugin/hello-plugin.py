@@ -4,53 +4,203 @@ R-Link Hello World 测试插件
 一个简单的演示插件，展示插件系统的基本功能
 """
 
-import argparse
-import json
 import os
 import sys
 import time
+import select
 import signal
-from datetime import datetime
+import socket
+import threading
+from types import SimpleNamespace
+
+LOG_PREFIX = "[HELLO-PLUGIN]"
+# 主循环输出行：时间戳、计数、消息
+LOG_TMPL = "[{0}] " + LOG_PREFIX + " [{1}] {2}\n"
+STDOUT_FD = 1
 
 # 全局变量
-running = True
+stop = threading.Event()
+# 最近一次格式化的时间戳（秒）及其字符串
+_last_sec = 0
+_last_ts_str = ""
+# (dumps, loads)，首次读写配置时选定
+_json_codec = None
+# 信号唤醒套接字对 (读端, 写端)，收到信号时 C 层信号处理向写端写入一个字节
+_wakeup_socks = None
 config = {
     "message": "Hello from R-Link!",
     "interval": 5
 }
+# 配置每次修改后递增，handle_command 据此判断缓存的响应是否失效
+_config_version = 0
+_cached_responses = {}
+_cached_version = -1
+
+def timestamp():
+    """当前时间的 "%Y-%m-%d %H:%M:%S" 字符串，同一秒内复用上次的结果"""
+    global _last_sec, _last_ts_str
+    now = int(time.time())
+    if now != _last_sec:
+        _last_ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        _last_sec = now
+    return _last_ts_str
+
+def log(msg):
+    """输出带时间戳和插件前缀的日志"""
+    print(f"[{timestamp()}] {LOG_PREFIX} {msg}")
 
 def signal_handler(signum, frame):
     """处理关闭信号"""
-    global running
-    print(f"[{datetime.now()}] [HELLO-PLUGIN] Received signal {signum}, shutting down...")
-    running = False
+    log(f"Received signal {signum}, shutting down...")
+    stop.set()
+
+# 命令行选项 -> 参数名，只有四个选项，不值得为此导入 argparse
+OPTIONS = {
+    "-c": "config", "--config": "config",
+    "-m": "message", "--message": "message",
+    "-i": "interval", "--interval": "interval",
+    "--message-override": "message_override",
+}
+USAGE = "usage: hello-plugin [-c CONFIG] [-m MESSAGE] [-i INTERVAL] [--message-override MESSAGE_OVERRIDE]"
+
+def usage_error(msg):
+    """与 argparse 一致：错误信息写到 stderr，退出码 2"""
+    print(f"{USAGE}\nhello-plugin: error: {msg}", file=sys.stderr)
+    sys.exit(2)
+
+def parse_args(argv):
+    """解析命令行参数，支持 "-c path" 和 "--config=path" 两种写法"""
+    args = dict.fromkeys(OPTIONS.values())
+    it = iter(argv)
+    for arg in it:
+        if arg in ("-h", "--help"):
+            print(USAGE)
+            sys.exit(0)
+        opt, sep, value = arg.partition("=")
+        name = OPTIONS.get(opt if sep and opt.startswith("--") else arg)
+        if name is None:
+            usage_error(f"unrecognized argument: {arg}")
+        if not (sep and opt.startswith("--")):
+            value = next(it, None)
+            if value is None:
+                usage_error(f"argument {arg}: expected one argument")
+        if name == "interval":
+            try:
+                value = int(value)
+            except ValueError:
+                usage_error(f"argument {arg}: invalid int value: '{value}'")
+        args[name] = value
+    return SimpleNamespace(**args)
+
+def install_signal_handlers():
+    """
+    注册关闭信号处理
+
+    POSIX：在主线程阻塞信号，由单独线程 sigwait 同步接收，信号不会在任意位置打断主线程
+    Windows：没有 sigwait，使用信号处理函数 + 唤醒套接字
+    """
+    signals = {signal.SIGINT, signal.SIGTERM}
+    if hasattr(signal, "pthread_sigmask"):
+        # 必须在创建其他线程之前屏蔽，新线程会继承信号掩码
+        signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+        threading.Thread(target=wait_signals, args=(signals,), daemon=True).start()
+    else:
+        for signum in signals:
+            signal.signal(signum, signal_handler)
+        setup_wakeup()
+
+def wait_signals(signals):
+    """信号线程：阻塞直到收到关闭信号"""
+    signum = signal.sigwait(signals)
+    signal_handler(signum, None)
+
+def setup_wakeup():
+    """创建信号唤醒套接字（Windows 上 set_wakeup_fd 只接受套接字，所以不用 pipe）"""
+    global _wakeup_socks
+    reader, writer = socket.socketpair()
+    reader.setblocking(False)
+    writer.setblocking(False)
+    signal.set_wakeup_fd(writer.fileno())
+    _wakeup_socks = (reader, writer)
+
+def wait_for_stop(timeout):
+    """最多等待 timeout 秒，收到关闭信号时立即返回 True"""
+    if _wakeup_socks is None:
+        # 信号由 sigwait 线程处理，直接等待停止事件
+        return stop.wait(timeout)
+
+    reader = _wakeup_socks[0]
+    readable, _, _ = select.select([reader], [], [], timeout)
+    if readable:
+        try:
+            reader.recv(64)
+        except BlockingIOError:
+            pass
+    return stop.is_set()
+
+def json_codec():
+    """按需选择 JSON 实现：优先 orjson，缺失时回退到标准库 json；dumps 返回 bytes"""
+    global _json_codec
+    if _json_codec is None:
+        try:
+            import orjson
+
+            def dumps(obj):
+                return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+            _json_codec = (dumps, orjson.loads)
+        except ImportError:
+            import json
+
+            def dumps(obj):
+                return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+            _json_codec = (dumps, json.loads)
+    return _json_codec
 
 def load_config(config_path):
     """加载配置文件"""
-    global config
+    global config, _config_version
+    # 只有指定了配置文件才需要 JSON 库，不在启动时导入
+    _, loads = json_codec()
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            loaded = json.load(f)
+        with open(config_path, 'rb') as f:
+            # orjson 不接受 UTF-8 BOM（Windows 记事本保存的文件会带上）
+            loaded = loads(f.read().removeprefix(b'\xef\xbb\xbf'))
             config.update(loaded)
-            print(f"[{datetime.now()}] [HELLO-PLUGIN] Config loaded: {config}")
+            _config_version += 1
+            log(f"Config loaded: {config}")
     except Exception as e:
-        print(f"[{datetime.now()}] [HELLO-PLUGIN] Failed to load config: {e}")
+        log(f"Failed to load config: {e}")
 
 def save_config(config_path):
     """保存配置文件"""
+    dumps, _ = json_codec()
     try:
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
-        print(f"[{datetime.now()}] [HELLO-PLUGIN] Config saved")
+        # 先写临时文件再替换，写入中途退出不会留下不完整的配置
+        tmp_path = config_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(config))
+        os.replace(tmp_path, config_path)
+        log("Config saved")
     except Exception as e:
-        print(f"[{datetime.now()}] [HELLO-PLUGIN] Failed to save config: {e}")
+        log(f"Failed to save config: {e}")
 
 def handle_command(cmd):
-    """处理自定义命令"""
+    """处理自定义命令（ping/info 的响应在配置变化前复用）"""
+    global _cached_version
+    if _cached_version != _config_version:
+        _cached_responses.clear()
+        _cached_version = _config_version
+
+    cached = _cached_responses.get(cmd)
+    if cached is not None:
+        return cached
+
     if cmd == "ping":
-        return {"status": "pong", "message": config["message"]}
+        response = {"status": "pong", "message": config["message"]}
     elif cmd == "info":
-        return {
+        response = {
             "name": "hello-plugin",
             "version": "1.0.0",
             "description": "Hello World 测试插件",
@@ -59,21 +209,20 @@ def handle_command(cmd):
     else:
         return {"error": "Unknown command", "command": cmd}
 
+    _cached_responses[cmd] = response
+    return response
+
 def main():
-    global running, config
+    global config, _config_version
+
+    # 输出通常接到宿主的日志文件上，按行刷新以便及时看到日志
+    sys.stdout.reconfigure(line_buffering=True)
 
     # 注册信号处理
-    signal.signal(signal.SIGTERM, signal_handler)
-    signal.signal(signal.SIGINT, signal_handler)
+    install_signal_handlers()
 
     # 解析命令行参数
-    parser = argparse.ArgumentParser(description='R-Link Hello Plugin')
-    parser.add_argument('-c', '--config', help='Configuration file path')
-    parser.add_argument('-m', '--message', help='Custom message')
-    parser.add_argument('-i', '--interval', type=int, help='Update interval (seconds)')
-    parser.add_argument('--message-override', help='Override message from config')
-
-    args = parser.parse_args()
+    args = parse_args(sys.argv[1:])
 
     # 加载配置文件
     if args.config:
@@ -84,39 +233,48 @@ def main():
         config["message"] = args.message
     if args.interval:
         config["interval"] = args.interval
+    if args.message or args.interval:
+        _config_version += 1
 
-    print(f"[{datetime.now()}] [HELLO-PLUGIN] ========================================")
-    print(f"[{datetime.now()}] [HELLO-PLUGIN]   R-Link Hello World Plugin v1.0.0")
-    print(f"[{datetime.now()}] [HELLO-PLUGIN] ========================================")
-    print(f"[{datetime.now()}] [HELLO-PLUGIN] Message: {config['message']}")
-    print(f"[{datetime.now()}] [HELLO-PLUGIN] Interval: {config['interval']} seconds")
-    print(f"[{datetime.now()}] [HELLO-PLUGIN] Config: {args.config}")
-    print(f"[{datetime.now()}] [HELLO-PLUGIN] ========================================")
+    # 启动信息一次输出，各行共用同一个时间戳
+    prefix = f"[{timestamp()}] {LOG_PREFIX} "
+    print("\n".join(prefix + line for line in (
+        "========================================",
+        "  R-Link Hello World Plugin v1.0.0",
+        "========================================",
+        f"Message: {config['message']}",
+        f"Interval: {config['interval']} seconds",
+        f"Config: {args.config}",
+        "========================================",
+    )))
 
     # 主循环
     counter = 0
+    # 循环内使用局部变量，配置版本变化时才重新读取
+    message = config["message"]
     interval = config["interval"]
+    seen_version = _config_version
 
     try:
-        while running:
-            print(f"[{datetime.now()}] [HELLO-PLUGIN] [{counter}] {config['message']}")
-            sys.stdout.flush()
+        while not stop.is_set():
+            if seen_version != _config_version:
+                message = config["message"]
+                interval = config["interval"]
+                seen_version = _config_version
 
-            # 等待间隔，同时检查运行状态
-            for _ in range(interval * 10):
-                if not running:
-                    break
-                time.sleep(0.1)
+            # 直接写文件描述符，绕过文本层的编码和锁；stdout 按行缓冲，此时缓冲区为空，不会乱序
+            os.write(STDOUT_FD, LOG_TMPL.format(timestamp(), counter, message).encode('utf-8', 'replace'))
 
-            if not running:
+            # 等待整个间隔，收到信号时立即返回
+            if wait_for_stop(interval):
                 break
 
             counter += 1
 
     except Exception as e:
-        print(f"[{datetime.now()}] [HELLO-PLUGIN] Error: {e}")
+        log(f"Error: {e}")
 
-    print(f"[{datetime.now()}] [HELLO-PLUGIN] Plugin stopped")
+    log("Plugin stopped")
 
 if __name__ == "__main__":
     main()